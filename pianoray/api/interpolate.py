@@ -39,8 +39,63 @@ def interpolate(k1: Keyframe, k2: Keyframe, frame: int) -> Any:
         return v1
 
     elif interp in (Interp.LINEAR, Interp.QUADRATIC):
-        fac = np.interp(frame, (f1, f2), (0, 1))  # Lerp
+        # Same arithmetic as np.interp(frame, (f1, f2), (0, 1)), without
+        # the overhead of calling numpy on scalars.
+        fac = 1 / (f2-f1) * (frame-f1)
         if interp == Interp.QUADRATIC:
             fac = quad_fac(fac)
 
         return lerp(fac, (0, 1), (v1, v2))
+
+
+def interpolate_frames(kf_frames: np.ndarray, kf_values: np.ndarray,
+        kf_interps: np.ndarray, frames: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``Property._get_value`` of many frames.
+    Requires at least two keyframes, sorted by frame.
+
+    :param kf_frames: Frame of each keyframe.
+    :param kf_values: Value of each keyframe.
+    :param kf_interps: Interp of each keyframe.
+    :param frames: Frames to get values of.
+    :return: Array of values, first axis corresponds to ``frames``.
+    """
+    n = len(kf_frames)
+
+    # Same as bisect_left in Property._get_value.
+    # kf_frames[i-1] < frame <= kf_frames[i]
+    i = np.clip(np.searchsorted(kf_frames, frames), 1, n-1)
+    f1 = kf_frames[i-1]
+    f2 = kf_frames[i]
+    interps = kf_interps[i-1]
+
+    # Frames that return a keyframe's value as is, and the keyframe's index.
+    exact = frames == f2
+    take = exact | (interps == Interp.CONSTANT)
+    src = np.where(exact, i, i-1)
+    after = frames >= kf_frames[-1]
+    take[after] = True
+    src[after] = n - 1
+    before = frames <= kf_frames[0]
+    take[before] = True
+    src[before] = 0
+
+    ret = kf_values[src]
+    if take.all():
+        return ret
+
+    # Broadcast over the value axes of array props.
+    axes = (slice(None),) + (None,) * (kf_values.ndim-1)
+    v1 = kf_values[i-1]
+    v2 = kf_values[i]
+
+    # Same arithmetic as np.interp and lerp in interpolate()
+    # f1 == f2 only for taken frames, so ignore the nan results.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fac = 1 / (f2-f1) * (frames-f1)
+        quad = interps == Interp.QUADRATIC
+        fac[quad] = np.where(fac[quad] < 0.5,
+            2 * fac[quad]**2, -2 * (fac[quad]-1)**2 + 1)
+        lerped = v1 + fac[axes] * (v2-v1)
+
+    return np.where(take[axes], ret, lerped)
@@ -1,10 +1,66 @@
-from typing import Any, Mapping, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
 
 from .accessor import Accessor
 from .props import Property
 
 
-class PropertyGroup:
+class _PropDescriptor:
+    """
+    Class attribute for each property of a PropertyGroup subclass.
+    Getting returns the Property object, and setting calls
+    ``Property.set_value``. Both index the instance's ``_prop_objs``
+    directly, without a dict lookup.
+    """
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance._prop_objs[self.index]
+
+    def __set__(self, instance, value: Any):
+        instance._prop_objs[self.index].set_value(value)
+
+
+def _class_props(cls) -> Mapping[str, Property]:
+    """
+    Properties annotated on cls and its bases, in definition order.
+    Base class properties come first, and can be overridden.
+    """
+    props = {}
+    for c in reversed(cls.__mro__):
+        for k, v in getattr(c, "__annotations__", {}).items():
+            if isinstance(v, Property):
+                props[k] = v
+
+    return props
+
+
+class PropertyGroupMeta(type):
+    """
+    Metaclass of PropertyGroup.
+    Collects the annotated properties once into ``_prop_template``, adds a
+    ``_PropDescriptor`` for each in definition order, and gives subclasses
+    empty ``__slots__`` so instances have no ``__dict__``.
+    """
+
+    def __new__(mcs, name, bases, ns):
+        ns.setdefault("__slots__", ())
+        cls = super().__new__(mcs, name, bases, ns)
+
+        cls._prop_template = tuple(_class_props(cls).items())
+        for i, (k, _) in enumerate(cls._prop_template):
+            setattr(cls, k, _PropDescriptor(i))
+
+        return cls
+
+
+class PropertyGroup(metaclass=PropertyGroupMeta):
     """
     Group of properties. Define a subclass to create your PropertyGroup.
     Define properties by creating annotations with ``:``. Don't override
@@ -35,38 +91,62 @@ class PropertyGroup:
         pgroup.temperature = -273         # Calls pgroup.temperature.set_value()
     """
 
+    __slots__ = ("_props", "_prop_names", "_prop_objs", "_cache")
+
     _props: Mapping[str, Property]
+    _prop_names: Tuple[str, ...]
+    _prop_objs: Tuple[Property, ...]
+    _cache: Dict[bool, Tuple[Tuple[int, int], Mapping[str, Any]]]
+    _prop_template: Tuple[Tuple[str, Property], ...]
 
     def __init__(self):
         """
-        Reads __annotations__ and stores in ``self._props``.
-        """
-        object.__setattr__(self, "_props", {})
-
-        for k, v in self.__annotations__.items():
-            if isinstance(v, Property):
-                self._props[k] = v
-
-    def __setattr__(self, name: str, value: Any):
-        """
-        ``pgroup.prop_name = 1``
-        is equivalent to
-        ``pgroup.prop_name.set_value(1)``
+        Copies the class's ``_prop_template`` into ``self._props``, so each
+        instance animates its own properties.
         """
-        self._props[name].set_value(value)
+        self._props = {k: v._copy() for k, v in self._prop_template}
+        self._cache = {}
 
-    def __getattr__(self, name: str) -> Property:
-        return self._props[name]
+        # Parallel tuples in definition order, indexed by _PropDescriptor
+        # and iterated in _values.
+        self._prop_names = tuple(self._props)
+        self._prop_objs = tuple(self._props.values())
 
     def _values(self, frame: int, use_mods: bool = True,
             default: Optional[Accessor] = None) -> Mapping[str, Any]:
         """
         Get values of all properties at frame.
         Returns ``{"prop_name": value}``.
+
+        The last result is cached for each ``use_mods``, until any property
+        is changed. ``default`` is assumed to be the scene's values at frame
+        0 without modifiers, as passed by ``Scene.values``.
+        Don't modify the returned mapping.
         """
-        ret = {}
-        for k, prop in self._props.items():
-            v = prop.value(frame, use_mods, default)
-            ret[k] = v
+        key = (frame, Property._edits)
+        cached = self._cache.get(use_mods)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        values = [p.value(frame, use_mods, default) for p in self._prop_objs]
+        ret = dict(zip(self._prop_names, values))
 
+        self._cache[use_mods] = (key, ret)
         return ret
+
+    def _values_range(self, frames: np.ndarray, use_mods: bool = True,
+            default: Optional[Accessor] = None) -> Mapping[str, np.ndarray]:
+        """
+        Get values of all properties at many frames.
+        Returns ``{"prop_name": array}``. See ``Property.value_range``.
+        """
+        return {k: p.value_range(frames, use_mods, default)
+            for k, p in zip(self._prop_names, self._prop_objs)}
+
+    def _bake(self, start: int, end: int) -> None:
+        """
+        Bake all properties from frame ``start`` to ``end``.
+        See ``Property.bake``.
+        """
+        for prop in self._prop_objs:
+            prop.bake(start, end)
@@ -1,11 +1,14 @@
+import copy
+import math
 import os
-from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Type
 
 import numpy as np
 
 from .accessor import Accessor
 from .keyframe import Keyframe, Interp
-from .interpolate import interpolate
+from .interpolate import interpolate, interpolate_frames
 from .modifiers import Modifier
 
 __all__ = (
@@ -20,6 +23,68 @@ __all__ = (
 )
 
 
+def _compile_verify(expr: str) -> Callable[[Any], bool]:
+    """
+    Compile ``verify(value)`` that returns ``expr``.
+    Used to paste a prop's constants (e.g. min and max) into the code,
+    instead of looking up and checking attributes on every call.
+    """
+    namespace = {}
+    exec(f"def verify(value):\n    return {expr}\n", namespace)
+    return namespace["verify"]
+
+def _literal(v: Any) -> Optional[str]:
+    """
+    Source code of a finite int or float, or None if it can't be pasted.
+    """
+    if type(v) in (int, float) and (isinstance(v, int) or math.isfinite(v)):
+        return repr(v)
+    return None
+
+def _compile_bounds(prop) -> None:
+    """
+    Replace ``prop.verify`` with a specialized min and max check,
+    if min and max can be pasted as literals. Otherwise, the class's
+    ``verify`` is used.
+    Same result as ``IntProp.verify``.
+    """
+    vars(prop).pop("verify", None)
+    conds = []
+    for v, op in ((prop.min, "<"), (prop.max, ">")):
+        if v is not None:
+            lit = _literal(v)
+            if lit is None:
+                return
+            conds.append(f"value {op} {lit}")
+
+    if conds:
+        prop.verify = _compile_verify(f"not ({' or '.join(conds)})")
+
+def _compile_shape(prop) -> None:
+    """
+    Replace ``prop.verify`` with a specialized shape check, if shape is
+    given. Otherwise, the class's ``verify`` is used.
+    Same result as ``ArrayProp.verify``.
+    """
+    vars(prop).pop("verify", None)
+    if prop.shape is not None:
+        shape = tuple(int(x) for x in prop.shape)
+        prop.verify = _compile_verify(f"value.shape == {shape!r}")
+
+def _compiled_attr(name: str, compile: Callable[[Any], None]) -> property:
+    """
+    Attribute that calls ``compile(prop)`` when set, so a specialized
+    ``verify`` always uses the current value. Stored as ``_<name>``.
+    """
+    private = "_" + name
+
+    def fset(prop, value):
+        setattr(prop, private, value)
+        compile(prop)
+
+    return property(lambda prop: getattr(prop, private), fset)
+
+
 class Property:
     """
     Property base class.
@@ -34,7 +99,16 @@ class Property:
     mods: Sequence[Modifier]
     default: Any
 
+    # Incremented when any property's value or keyframes change.
+    # PropertyGroup uses this to invalidate cached values.
+    _edits: int = 0
+
     _keyframes: List[Keyframe]
+    _keyframe_frames: List[int]
+    _last_idx: int
+    _kf_arrays: Optional[Tuple[np.ndarray, ...]]
+    _baked: Optional[np.ndarray]
+    _baked_start: int
     _value: Any
 
     def __init__(self, name: str = "", desc: str = "", animatable: bool = True,
@@ -59,11 +133,31 @@ class Property:
         self.default = default if default is None else self.type(default)
 
         self._keyframes = []
+        self._keyframe_frames = []
+        self._last_idx = 0
+        self._kf_arrays = None
+        self._baked = None
+        self._baked_start = 0
         self._value = None
 
         if self.default is not None:
             assert self.verify(self.default)
 
+    def _copy(self) -> "Property":
+        """
+        Copy with its own keyframes, value, and caches, used for each
+        PropertyGroup instance.
+        Settings and the default are shared, as they are not modified in
+        place. Values stay read only, unlike with ``copy.deepcopy``.
+        """
+        prop = copy.copy(self)
+        prop._keyframes = list(self._keyframes)
+        prop._keyframe_frames = list(self._keyframe_frames)
+        prop._last_idx = 0
+        prop._kf_arrays = None
+        prop._baked = None
+        return prop
+
     def set_value(self, value: Any):
         """
         Checks validity and sets self._value
@@ -71,6 +165,8 @@ class Property:
         value = self.type(value)
         assert self.verify(value)
         self._value = value
+        self._baked = None
+        Property._edits += 1
 
     def animate(self, *args) -> None:
         """
@@ -103,7 +199,16 @@ class Property:
         for k in keyframes:
             k.value = self.type(k.value)
         assert all(self.verify(k.value) for k in keyframes)
-        self._keyframes.extend(keyframes)
+
+        # Keep _keyframes and _keyframe_frames sorted in parallel.
+        # bisect_right keeps keyframes on the same frame in insertion order.
+        for k in keyframes:
+            i = bisect_right(self._keyframe_frames, k.frame)
+            self._keyframe_frames.insert(i, k.frame)
+            self._keyframes.insert(i, k)
+        self._kf_arrays = None
+        self._baked = None
+        Property._edits += 1
 
     def verify(self, value: Any) -> bool:
         """
@@ -115,6 +220,73 @@ class Property:
         """
         return True
 
+    def _cast(self, value: Any) -> Any:
+        """
+        Convert value returned by ``self._get_value`` to the prop's type.
+        Skips the conversion if it is already the type.
+        Override in subclass if ``self.type`` is not a class.
+        """
+        return value if type(value) is self.type else self.type(value)
+
+    def _cast_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Convert an array of values to the prop's type, the same as
+        ``self._cast`` on each value, e.g. truncating for IntProp.
+        Override in subclass if ``self.type`` is not a class.
+        """
+        return values.astype(self.type, copy=False)
+
+    def bake(self, start: int, end: int) -> None:
+        """
+        Precompute values of frames ``start`` to ``end`` inclusive, so
+        ``self.value`` of those frames is an array lookup.
+        Modifiers are still applied in ``self.value``.
+
+        Does nothing if there are less than two keyframes, as the value
+        doesn't change, or if the keyframe values can't form one array,
+        e.g. arrays of different shapes. Animating or setting the value
+        clears the bake.
+        """
+        self._baked = None
+        if len(self._keyframes) < 2:
+            return
+
+        arrays = self._keyframe_arrays()
+        if arrays is None:
+            return
+
+        self._baked = interpolate_frames(*arrays, np.arange(start, end+1))
+        self._baked.setflags(write=False)
+        self._baked_start = start
+
+    def _keyframe_arrays(self) \
+            -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Returns arrays of the frames, values, and interps of the keyframes,
+        sorted by frame. Returns None if the values can't be stacked into
+        one regular array, e.g. ArrayProp values of different shapes.
+        Built on first use after animating, and cached until the next
+        ``self.animate``. Don't modify the arrays.
+        """
+        if self._kf_arrays is None:
+            keys = self._keyframes
+            try:
+                values = np.array([k.value for k in keys])
+            except ValueError:
+                values = None
+
+            if values is None or values.dtype == object:
+                # Empty tuple marks irregular values, so this isn't retried.
+                self._kf_arrays = ()
+            else:
+                self._kf_arrays = (
+                    np.array(self._keyframe_frames),
+                    values,
+                    np.array([k.interp for k in keys]),
+                )
+
+        return self._kf_arrays or None
+
     def _get_value(self, frame: int) -> Any:
         """
         Returns the value, but not necessarily the correct type.
@@ -123,19 +295,20 @@ class Property:
         Call ``self.value(frame)`` instead to convert to the prop's type and
         apply modifiers.
         """
-        keys = sorted(self._keyframes)
-
-        if len(keys) == 0:
-            if self._value is None:
-                if self.default is None:
-                    if self.required:
-                        raise ValueError("Both value and default are None.")
-                    else:
-                        return None
+        keys = self._keyframes
+        n = len(keys)
+
+        # Not animated, the most common case. Returns before any keyframe work.
+        if n == 0:
+            if self._value is not None:
+                return self._value
+            if self.default is not None:
                 return self.default
-            return self._value
+            if self.required:
+                raise ValueError("Both value and default are None.")
+            return None
 
-        elif len(keys) == 1:
+        elif n == 1:
             return keys[0].value
 
         else:
@@ -144,15 +317,19 @@ class Property:
             elif frame >= keys[-1].frame:
                 return keys[-1].value
             else:
-                for i, k in enumerate(keys):
-                    if k.frame == frame:
-                        return k.value
-                    if k.frame > frame:
-                        break
+                # Frames are usually requested in order, so the pair from
+                # the last call is checked before searching.
+                # keys[0].frame < frame < keys[-1].frame, so 0 < i < n
+                frames = self._keyframe_frames
+                i = self._last_idx + 1
+                if not frames[i-1] < frame <= frames[i]:
+                    i = bisect_left(frames, frame)
+                    self._last_idx = i - 1
+
+                if frames[i] == frame:
+                    return keys[i].value
 
-                k1 = keys[i-1]
-                k2 = keys[i]
-                return interpolate(k1, k2, frame)
+                return interpolate(keys[i-1], keys[i], frame)
 
     def value(self, frame: int, use_mods: bool = True,
             default: Optional[Accessor] = None) -> Any:
@@ -160,12 +337,66 @@ class Property:
         Returns value at frame. Uses keyframe interpolations.
         Converts to type. Applies modifiers.
         """
-        v = self.type(self._get_value(frame))
+        baked = self._baked
+        if baked is not None and isinstance(frame, (int, np.integer)) \
+                and 0 <= frame - self._baked_start < len(baked):
+            v = self._cast(baked[frame - self._baked_start])
+        else:
+            v = self._cast(self._get_value(frame))
+
         if use_mods:
             for m in self.mods:
                 v = m(default, v)
         return v
 
+    def value_range(self, frames: np.ndarray, use_mods: bool = True,
+            default: Optional[Accessor] = None) -> np.ndarray:
+        """
+        Returns values at many frames at once, as an array whose first axis
+        corresponds to ``frames``. Applies modifiers.
+
+        Values are converted with ``self._cast_array`` before modifiers,
+        like ``self.value``. For float props with all keyframes LINEAR,
+        uses ``np.interp``, which can differ from ``self.value`` by float
+        rounding.
+
+        If the keyframe values can't form one array, calls ``self.value``
+        on each frame. Values of different shapes are then returned as an
+        object array.
+        """
+        frames = np.asarray(frames)
+        keys = self._keyframes
+
+        if len(keys) < 2:
+            v = np.asarray(self._get_value(0))
+            ret = np.repeat(v[None, ...], len(frames), axis=0)
+
+        elif self._keyframe_arrays() is None:
+            values = [self.value(f, use_mods, default) for f in frames]
+            try:
+                return np.array(values)
+            except ValueError:
+                ret = np.empty(len(values), dtype=object)
+                ret[:] = values
+                return ret
+
+        else:
+            kf_frames, kf_values, kf_interps = self._keyframe_arrays()
+            # Last keyframe's interp is never used.
+            linear = self.type is float and kf_values.ndim == 1 \
+                and np.all(kf_interps[:-1] == Interp.LINEAR) \
+                and np.all(np.diff(kf_frames) > 0)
+            if linear:
+                ret = np.interp(frames, kf_frames, kf_values)
+            else:
+                ret = interpolate_frames(kf_frames, kf_values, kf_interps, frames)
+
+        ret = self._cast_array(ret)
+        if use_mods:
+            for m in self.mods:
+                ret = m(default, ret)
+        return ret
+
 
 class BoolProp(Property):
     """
@@ -188,15 +419,22 @@ class IntProp(Property):
     max: int
     coords: bool
 
+    min = _compiled_attr("min", _compile_bounds)
+    max = _compiled_attr("max", _compile_bounds)
+
     def __init__(self, min: Optional[int] = None, max: Optional[int] = None,
             coords: bool = False, **kwargs) -> None:
-        self.min = min
-        self.max = max
+        # Set both before compiling once.
+        self._min = min
+        self._max = max
+        _compile_bounds(self)
         super().__init__(**kwargs)
 
     def verify(self, value: int) -> bool:
         """
         Checks min and max.
+        Replaced with a specialized version whenever min or max is set,
+        see ``_compile_bounds``.
         """
         if self.min is not None and value < self.min:
             return False
@@ -218,10 +456,15 @@ class FloatProp(Property):
     max: int
     coords: bool
 
+    min = _compiled_attr("min", _compile_bounds)
+    max = _compiled_attr("max", _compile_bounds)
+
     def __init__(self, min: Optional[float] = None, max: Optional[float] = None,
             coords: bool = False, **kwargs) -> None:
-        self.min = min
-        self.max = max
+        # Set both before compiling once.
+        self._min = min
+        self._max = max
+        _compile_bounds(self)
         super().__init__(**kwargs)
 
     def verify(self, value: float) -> bool:
@@ -291,15 +534,28 @@ class PathProp(StrProp):
         return True
 
 
+def _readonly_array(value: Any) -> np.ndarray:
+    """
+    Copy of value as a read only numpy array.
+    """
+    value = np.array(value)
+    value.setflags(write=False)
+    return value
+
+
 class ArrayProp(Property):
     """
     Numpy array property.
+    Stored values are read only, so ``self.value`` can return them
+    without copying.
     """
-    type = np.array
+    type = staticmethod(_readonly_array)
     supported_interps = {Interp.CONSTANT, Interp.LINEAR, Interp.QUADRATIC}
 
     shape: Optional[Tuple[int]]
 
+    shape = _compiled_attr("shape", _compile_shape)
+
     def __init__(self, shape: Optional[Tuple[int]] = None, **kwargs) -> None:
         self.shape = shape
         super().__init__(**kwargs)
@@ -307,11 +563,26 @@ class ArrayProp(Property):
     def verify(self, value: np.ndarray) -> bool:
         """
         Checks shape.
+        Replaced with a specialized version whenever shape is set, see
+        ``_compile_shape``.
         """
         if self.shape is not None and value.shape != tuple(self.shape):
             return False
         return True
 
+    def _cast(self, value: Any) -> np.ndarray:
+        """
+        Stored values are read only, and interpolated values are new
+        arrays, so any array is returned as is.
+        """
+        return value if isinstance(value, np.ndarray) else self.type(value)
+
+    def _cast_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Arrays need no conversion.
+        """
+        return values
+
 
 class RGBProp(ArrayProp):
     """
@@ -346,3 +617,9 @@ if __name__ == "__main__":
     i.animate(Keyframe(10, 15, Interp.CONSTANT))
     print([i.value(a) for a in range(0, 6)])
     print([i.value(a) for a in range(5, 11)])
+
+    a = RGBProp(name="asdf", desc="desc", default=(1, 0, 0))._copy()
+    assert not a.value(0).flags.writeable
+    a.animate((0, (1, 0, 0), Interp.LINEAR), (10, (0, 0, 1), Interp.LINEAR))
+    a.bake(0, 10)
+    assert not a.value(5).flags.writeable
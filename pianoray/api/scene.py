@@ -1,4 +1,6 @@
-from typing import Any, Mapping, Type
+from typing import Any, Mapping, Optional, Sequence, Tuple, Type
+
+import numpy as np
 
 from .accessor import Accessor
 from .pgroup import PropertyGroup
@@ -29,13 +31,24 @@ class Scene:
                 self.food.temperature = 100
     """
     _pgroups: Mapping[str, PropertyGroup]
+    _pgroup_names: Tuple[str, ...]
+    _pgroup_objs: Tuple[PropertyGroup, ...]
 
     def __init__(self):
         """
         Initializes pgroups.
         """
+        self._freeze()
         self.setup()
 
+    def _freeze(self) -> None:
+        """
+        Store ``_pgroups`` as parallel tuples in definition order, for
+        iterating. Name lookup still uses ``_pgroups``.
+        """
+        self._pgroup_names = tuple(self._pgroups)
+        self._pgroup_objs = tuple(self._pgroups.values())
+
     def __getattr__(self, name: str) -> PropertyGroup:
         if name == "default":
             return object.__getattribute__(self, "default")
@@ -47,13 +60,38 @@ class Scene:
         """
         default = self.values(0, False) if use_mods else None
 
-        ret = {}
-        for k, pgroup in self._pgroups.items():
-            v = pgroup._values(frame, use_mods, default)
-            ret[k] = v
+        values = [g._values(frame, use_mods, default) for g in self._pgroup_objs]
+        ret = dict(zip(self._pgroup_names, values))
 
         return Accessor(ret)
 
+    def values_range(self, frames: np.ndarray, use_mods: bool = True,
+            pgroups: Optional[Sequence[str]] = None) -> Accessor:
+        """
+        Returns Accessor object of pgroup values at many frames.
+        Each value is an array whose first axis corresponds to ``frames``.
+        See ``Property.value_range``.
+
+        :param pgroups: Names of pgroups to get. If None, gets all.
+        """
+        default = self.values(0, False) if use_mods else None
+        if pgroups is None:
+            pgroups = self._pgroup_names
+
+        ret = {name: self._pgroups[name]._values_range(frames, use_mods, default)
+            for name in pgroups}
+
+        return Accessor(ret)
+
+    def bake(self, start: int, end: int) -> None:
+        """
+        Bake all pgroups from frame ``start`` to ``end``, so getting values
+        in that range is faster. Call this after setup, before rendering.
+        See ``Property.bake``.
+        """
+        for pgroup in self._pgroup_objs:
+            pgroup._bake(start, end)
+
     @property
     def default(self) -> Accessor:
         """
@@ -5,9 +5,11 @@ C++ library compilation and handling.
 import ctypes
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from subprocess import Popen
-from typing import List, Mapping, Sequence
+from subprocess import PIPE, STDOUT, Popen
+from typing import Dict, List, Mapping, Optional, Sequence
 
 import numpy as np
 from numpy.ctypeslib import ndpointer
@@ -19,6 +21,9 @@ ROOT = Path(__file__).absolute().parent
 
 CPP_UTILS = ROOT / "cutils"
 
+# Libraries loaded by this process, keyed by real path of the .so file.
+_LIB_CACHE: Dict[str, ctypes.CDLL] = {}
+
 
 class Types:
     """
@@ -29,6 +34,7 @@ class Types:
     _arr_flags = "aligned, c_contiguous"
     _arr_code = "{0}_{1} = ndpointer(dtype={1}, ndim={2}, flags=_arr_flags)"
 
+    ptr = ctypes.c_void_p
     char = ctypes.c_int8
     uchar = ctypes.c_uint8
     int = ctypes.c_int32
@@ -46,13 +52,12 @@ class Types:
     def cstr(s):
         """
         Numpy array of chars, null terminated.
+        Read only view of the bytes, not a copy per byte.
         """
         if not isinstance(s, bytes):
             s = str(s).encode()
 
-        data = list(s)
-        data.append(0)
-        return np.array(data, dtype=np.int8)
+        return np.frombuffer(s + b"\0", dtype=np.int8)
 
     @staticmethod
     def c_to_attr(type):
@@ -77,55 +82,125 @@ def build_lib(cache: Path, files: Sequence[str], name: str) -> ctypes.CDLL:
     :param name: Name of the library.
     :return: C library.
     """
-    logger.info(f"Building C library {name}")
-
     cache = cache / name
     os.makedirs(cache, exist_ok=True)
 
     files = [ROOT/f for f in files]
+    lib_path = str(cache / f"lib{name}.so")
+
+    real_path = os.path.realpath(lib_path)
+    if real_path in _LIB_CACHE:
+        return _LIB_CACHE[real_path]
+
+    if is_built(lib_path, files):
+        logger.info(f"Using cached C library {name}")
+        lib = _LIB_CACHE[real_path] = ctypes.CDLL(lib_path)
+        return lib
 
+    logger.info(f"Building C library {name}")
+
+    # Compile all files in parallel.
     obj_files = []
+    procs = []
     for f in files:
         obj_path = str(cache / f.with_suffix(".o").name)
         obj_files.append(obj_path)
-        compile(str(f), obj_path)
+        procs.append(start_compile(str(f), obj_path))
+    for p in procs:
+        finish(p)
+    assert all(p.returncode == 0 for p in procs)
 
-    lib_path = str(cache / f"lib{name}.so")
     link(obj_files, lib_path)
 
-    return ctypes.CDLL(lib_path)
+    lib = _LIB_CACHE[real_path] = ctypes.CDLL(lib_path)
+    return lib
+
+def is_built(lib_path, files) -> bool:
+    """
+    Whether the library exists and is newer than its C++ files and all
+    headers in ``CPP_UTILS``, so it doesn't need to be built again.
+    """
+    if not os.path.isfile(lib_path):
+        return False
+
+    mtimes = [os.path.getmtime(f) for f in files]
+    with os.scandir(CPP_UTILS) as entries:
+        for entry in entries:
+            if entry.name.endswith(".hpp"):
+                mtimes.append(entry.stat().st_mtime)
+
+    return os.path.getmtime(lib_path) >= max(mtimes)
 
 def compile(cpp, obj):
     """
     Compile a C++ file and output to obj file.
     """
-    args = [GCC, "-Wall", "-O3", "-c", "-fPIC", cpp, "-o", obj, "-I", CPP_UTILS]
-    p = Popen(args)
-    p.wait()
+    p = start_compile(cpp, obj)
+    finish(p)
     assert p.returncode == 0
 
+def start_compile(cpp, obj) -> Popen:
+    """
+    Start compiling a C++ file to obj file, without waiting.
+    Output is captured, see ``finish``.
+    """
+    args = [GCC, "-Wall", "-O3", "-c", "-fPIC", cpp, "-o", obj, "-I", CPP_UTILS]
+    return Popen(args, stdout=PIPE, stderr=STDOUT)
+
+def finish(p: Popen) -> None:
+    """
+    Wait for a compiler process, then print its output in one write,
+    so output of libraries built in parallel doesn't interleave.
+    """
+    out, _ = p.communicate()
+    if out:
+        sys.stderr.write(out.decode(errors="replace"))
+
 def link(obj_files, lib_path):
     """
     Link object files.
     """
     args = [GCC, "-shared", "-o", lib_path, *obj_files]
-    p = Popen(args)
-    p.wait()
+    p = Popen(args, stdout=PIPE, stderr=STDOUT)
+    finish(p)
     assert p.returncode == 0
 
 
-def parse_args(path, func_name) -> List:
+def find_decl(path, func_name):
     """
-    Use regex to parse the arguments of a C++ function.
-    Don't need to manually set them with CDLL.argtypes = [...]
+    Find the declaration of an ``extern "C"`` function returning
+    ``void`` or ``void*``.
+
+    :return: ``(file contents, regex match)``. Group 1 of the match is the
+        return type.
     """
     with open(path, "r") as fp:
         data = fp.read()
 
-    start = re.search(r'extern\s*"C"\s*void\s*' + func_name, data)
-    if start is None:
+    match = re.search(r'extern\s*"C"\s*(void\s*\**)\s*' + func_name + r"\s*\(",
+        data)
+    if match is None:
         raise ValueError("Function declaration not found.")
-    start = start.start()
+
+    return data, match
+
+
+def parse_restype(path, func_name):
+    """
+    Return type of a C++ function for CDLL.restype.
+    ``Types.ptr`` for ``void*``, else None.
+    """
+    _, match = find_decl(path, func_name)
+    return Types.ptr if "*" in match.group(1) else None
+
+
+def parse_args(path, func_name) -> List:
+    """
+    Use regex to parse the arguments of a C++ function.
+    Don't need to manually set them with CDLL.argtypes = [...]
+    """
+    data, match = find_decl(path, func_name)
+    start = match.start()
 
     arg_str = data[data.find("(", start)+1 : data.find(")", start)]
     arg_strs = map(str.strip, arg_str.strip().split(","))
@@ -137,6 +212,8 @@ def parse_args(path, func_name) -> List:
 
         if type in ("CImg", "DImg"):
             attr = "img_uchar" if type == "CImg" else "img_double"
+        elif type == "void" and ptr:
+            attr = "ptr"
         else:
             attr = Types.c_to_attr(type)
             if ptr:
@@ -157,6 +234,7 @@ def load_one_lib(cache: Path, cfiles, name, funcs) -> ctypes.CDLL:
         for file in cfiles:
             try:
                 args = parse_args(file, func)
+                restype = parse_restype(file, func)
                 break
             except ValueError:
                 pass
@@ -164,24 +242,42 @@ def load_one_lib(cache: Path, cfiles, name, funcs) -> ctypes.CDLL:
             raise ValueError(f"Function {func} not found in library {name}.")
 
         setattr(getattr(lib, func), "argtypes", args)
+        setattr(getattr(lib, func), "restype", restype)
 
     return lib
 
-def load_libs(cache: Path) -> Mapping[str, ctypes.CDLL]:
+def load_libs(cache: Path,
+        optional: Sequence[str] = ()) -> Mapping[str, Optional[ctypes.CDLL]]:
     """
     Load C libraries.
+
+    :param optional: Libraries that have a fallback. If building one
+        fails, a warning is logged and its value is None.
     """
     cache = cache / "c_libs"
     cache.mkdir(parents=True, exist_ok=True)
 
     libs = {
-        "blocks": (["blocks.cpp"], ["render_blocks"]),
+        "blocks": (["blocks.cpp"],
+            ["notes_parse", "notes_free", "render_blocks", "render_blocks_batch"]),
         "composite": (["composite.cpp"], ["composite"]),
     }
 
-    real_libs = {}
-    for key, (files, funcs) in libs.items():
-        files = [str(CPP_UTILS / f) for f in files]
-        real_libs[key] = load_one_lib(cache, files, key, funcs)
-
-    return real_libs
+    # Build libraries in parallel. Threads only wait on the compiler.
+    with ThreadPoolExecutor() as pool:
+        futures = {}
+        for key, (files, funcs) in libs.items():
+            files = [str(CPP_UTILS / f) for f in files]
+            futures[key] = pool.submit(load_one_lib, cache, files, key, funcs)
+
+    ret = {}
+    for key, f in futures.items():
+        try:
+            ret[key] = f.result()
+        except (AssertionError, OSError):
+            if key not in optional:
+                raise
+            logger.warn(f"Failed to build C library {key}, using fallback.")
+            ret[key] = None
+
+    return ret
@@ -1,4 +1,5 @@
 #include <iostream>
+#include <vector>
 
 #include "pr_image.hpp"
 #include "pr_midi.hpp"
@@ -72,21 +73,68 @@ void draw_block(ImageD& img, const Rect& rect, const ColorD& color, double radiu
 
 
 /**
- * New render blocks.
+ * Notes parsed once from the serialized string, with X bounds cached
+ * for the last width and black key width used.
+ * Python side holds a pointer, from notes_parse.
  */
-extern "C" void render_blocks(
-    DImg d_img, int width, int height,
-    int frame, char* notes_str,
-    double p_video_fps, double p_piano_blackWidthFac, double p_blocks_speed,
-    double* dp_blocks_color, double p_blocks_radius, double p_blocks_bottomGlow,
-    double p_blocks_bottomGlowLen
+struct Notes {
+    std::vector<Note> notes;
+    std::vector<double> x_starts, x_ends;
+    int x_width = -1;
+    double x_black_width_fac = -1;
+
+    Notes(char* notes_str) {
+        Midi midi(notes_str);
+        notes.resize(midi.count);
+        for (int i = 0; i < midi.count; i++)
+            notes[i] = midi[i];
+    }
+
+    /**
+     * Compute X bounds of every note if width or black width changed.
+     * They don't change between frames.
+     */
+    void update_x_coords(int width, double black_width_fac) {
+        if (width == x_width && black_width_fac == x_black_width_fac)
+            return;
+
+        x_starts.resize(notes.size());
+        x_ends.resize(notes.size());
+        for (size_t i = 0; i < notes.size(); i++)
+            key_coords(x_starts[i], x_ends[i], notes[i].note, width, black_width_fac);
+
+        x_width = width;
+        x_black_width_fac = black_width_fac;
+    }
+};
+
+
+/**
+ * Parse serialized notes. Free the result with notes_free.
+ */
+extern "C" void* notes_parse(char* notes_str) {
+    return new Notes(notes_str);
+}
+
+extern "C" void notes_free(void* handle) {
+    delete (Notes*)handle;
+}
+
+
+/**
+ * Draw all blocks of one frame.
+ * X bounds of notes must be up to date.
+ */
+void draw_frame(
+    ImageD& img, const Notes& notes,
+    int frame, double p_video_fps, double p_blocks_speed,
+    const ColorD& p_blocks_color, double p_blocks_radius,
+    double p_blocks_bottomGlow, double p_blocks_bottomGlowLen
 ) {
-    ImageD img(d_img, width, height);
-    Midi midi(notes_str);
-    ColorD p_blocks_color(dp_blocks_color);
+    const int height = img.height;
 
-    for (int i = 0; i < midi.count; i++) {
-        const Note note = midi[i];
+    for (size_t i = 0; i < notes.notes.size(); i++) {
+        const Note& note = notes.notes[i];
 
         // Y bounds of rect.
         double y_start = event_coord(note.start, frame, height, p_video_fps,
@@ -106,17 +154,64 @@ extern "C" void render_blocks(
         if (y_down < 0 || y_up > height/2)
             continue;
 
-        // X bounds of note.
-        double x_start, x_end;
-        key_coords(x_start, x_end, note.note, width, p_piano_blackWidthFac);
-
         Rect rect;
-        rect.x = x_start;
+        rect.x = notes.x_starts[i];
         rect.y = y_up;
-        rect.w = x_end - x_start;
+        rect.w = notes.x_ends[i] - notes.x_starts[i];
         rect.h = y_down - y_up;
 
         draw_block(img, rect, p_blocks_color, p_blocks_radius, p_blocks_bottomGlow,
             p_blocks_bottomGlowLen);
     }
 }
+
+
+/**
+ * New render blocks.
+ *
+ * @param notes_handle  Parsed notes, from notes_parse.
+ */
+extern "C" void render_blocks(
+    DImg d_img, int width, int height,
+    int frame, void* notes_handle,
+    double p_video_fps, double p_piano_blackWidthFac, double p_blocks_speed,
+    double* dp_blocks_color, double p_blocks_radius, double p_blocks_bottomGlow,
+    double p_blocks_bottomGlowLen
+) {
+    ImageD img(d_img, width, height);
+    Notes& notes = *(Notes*)notes_handle;
+    ColorD p_blocks_color(dp_blocks_color);
+
+    notes.update_x_coords(width, p_piano_blackWidthFac);
+    draw_frame(img, notes, frame, p_video_fps, p_blocks_speed, p_blocks_color,
+        p_blocks_radius, p_blocks_bottomGlow, p_blocks_bottomGlowLen);
+}
+
+
+/**
+ * Render blocks of ``frame_count`` consecutive frames.
+ *
+ * @param d_imgs  Images of shape (frame_count, height, width, 3), passed
+ *     as (frame_count*height, width, 3).
+ * @param notes_handle  Parsed notes, from notes_parse.
+ * @param dp_*  Animatable props, one value per frame (three for color).
+ */
+extern "C" void render_blocks_batch(
+    DImg d_imgs, int width, int height,
+    int frame_start, int frame_count, void* notes_handle,
+    double p_video_fps, double p_piano_blackWidthFac, double* dp_blocks_speed,
+    double* dp_blocks_color, double* dp_blocks_radius,
+    double* dp_blocks_bottomGlow, double* dp_blocks_bottomGlowLen
+) {
+    Notes& notes = *(Notes*)notes_handle;
+    notes.update_x_coords(width, p_piano_blackWidthFac);
+
+    for (int f = 0; f < frame_count; f++) {
+        ImageD img(d_imgs + (long)f*width*height*3, width, height);
+        ColorD p_blocks_color(dp_blocks_color + 3*f);
+
+        draw_frame(img, notes, frame_start+f, p_video_fps, dp_blocks_speed[f],
+            p_blocks_color, dp_blocks_radius[f], dp_blocks_bottomGlow[f],
+            dp_blocks_bottomGlowLen[f]);
+    }
+}
@@ -0,0 +1,146 @@
+"""
+Numba implementation of the blocks effect.
+Used if the C library is not available.
+Same algorithm as ``cutils/blocks.cpp``.
+
+Numba is optional. ``render_blocks_nb`` is None if it is not installed.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _is_white_key(key):
+    v = key % 12
+    return not (v == 1 or v == 4 or v == 6 or v == 9 or v == 11)
+
+def _key_pos(key):
+    white_width = 1.0 / 52
+
+    last_white = False
+    pos = 0.0
+    for k in range(key+1):
+        white = _is_white_key(k)
+        if white and last_white:
+            pos += white_width
+        else:
+            pos += white_width / 2
+        last_white = white
+
+    return pos
+
+def _dist_to_block(px, py, x, y, w, h, r):
+    # Mirror across block center to simply calcs.
+    half_x = x + w/2
+    half_y = y + h/2
+    if px > half_x:
+        px -= 2 * (px-half_x)
+    if py > half_y:
+        py -= 2 * (py-half_y)
+
+    # Center of rounding.
+    cx = x + r
+    cy = y + r
+
+    if px < cx and py < cy:
+        return ((cx-px)**2 + (cy-py)**2) ** 0.5 - r
+    elif px < x and py >= cy:
+        return x - px
+    elif px >= cx and py < y:
+        return y - py
+    else:
+        return 0.0
+
+def _bounds(v, vmin, vmax):
+    return min(max(v, vmin), vmax)
+
+def _render_blocks(img, frame, starts, ends, keys, fps, black_width_fac,
+        speed, color, radius, bottom_glow, bottom_glow_len):
+    height, width = img.shape[:2]
+    half = height // 2
+    white_width = float(width // 52)
+    speed = speed * (half / int(fps))
+
+    # Rects of visible notes, in note order.
+    n = len(starts)
+    rects = np.empty((n, 4), dtype=np.float64)
+    count = 0
+    for i in range(n):
+        y_start = half + speed * (frame-starts[i])
+        y_end = half + speed * (frame-ends[i])
+        y_up = min(y_start, y_end)
+        y_down = max(y_start, y_end)
+        if y_down < 0 or y_up > half:
+            continue
+
+        center = _key_pos(keys[i]) * width
+        key_width = white_width if _is_white_key(keys[i]) else \
+            white_width * black_width_fac
+        left = center - key_width/2
+        right = center + key_width/2
+        rects[count, 0] = left
+        rects[count, 1] = y_up
+        rects[count, 2] = right - left
+        rects[count, 3] = y_down - y_up
+        count += 1
+
+    # Each row is independent. Notes are drawn in order within a row,
+    # so overlapping blocks blend the same as the C version.
+    for py in prange(half):
+        for i in range(count):
+            x, y, w, h = rects[i, 0], rects[i, 1], rects[i, 2], rects[i, 3]
+            y_min = int(_bounds(y-1, 0, half))
+            y_max = int(_bounds(y+h+2, 0, half))
+            if py < y_min or py >= y_max:
+                continue
+
+            x_min = int(_bounds(x-1, 0, width-1))
+            x_max = int(_bounds(x+w+2, 0, width-1))
+            playing = (y+h) >= half
+            mult = 1.0
+            if playing and half-py <= bottom_glow_len:
+                glow_fac = 1 - (half-py) / bottom_glow_len
+                mult = 1 + glow_fac**2 * (bottom_glow-1)
+
+            for px in range(x_min, x_max):
+                dist = _dist_to_block(float(px), float(py), x, y, w, h, radius)
+                fac = _bounds(1-dist, 0, 1)
+                for c in range(3):
+                    img[py, px, c] = color[c] * mult * fac + \
+                        img[py, px, c] * (1-fac)
+
+
+if njit is None:
+    render_blocks_nb = None
+
+else:
+    _jit = njit(cache=True, fastmath=True)
+    _is_white_key = _jit(_is_white_key)
+    _key_pos = _jit(_key_pos)
+    _dist_to_block = _jit(_dist_to_block)
+    _bounds = _jit(_bounds)
+    render_blocks_nb = njit(cache=True, parallel=True, fastmath=True)(
+        _render_blocks)
+
+
+def warmup() -> None:
+    """
+    Compile ``render_blocks_nb`` with small inputs, so the first frame
+    doesn't include compile time.
+    Inputs have the same types as when rendering. Numba compiles separately
+    for read only arrays, and prop colors are read only.
+    """
+    if render_blocks_nb is None:
+        return
+
+    img = np.zeros((2, 52, 3), dtype=np.float64)
+    notes = np.zeros(1, dtype=np.float64)
+    keys = np.zeros(1, dtype=np.int64)
+    color = np.zeros(3, dtype=np.float64)
+    color.setflags(write=False)
+    render_blocks_nb(img, 0, notes, notes+1, keys, 30, 0.6, 1.0, color,
+        1.0, 1.0, 1.0)
@@ -2,8 +2,11 @@
 Blocks effect.
 """
 
+from typing import Optional
+
 import numpy as np
 
+from ..api.accessor import Accessor
 from ..cpp import Types
 from .effect import Effect
 
@@ -13,15 +16,115 @@ class Blocks(Effect):
     The blocks that fall down.
     """
 
+    def __init__(self, props, cache, libs, notes) -> None:
+        super().__init__(props, cache, libs, notes)
+
+        self.starts = np.array([n.start for n in notes], dtype=np.float64)
+        self.ends = np.array([n.end for n in notes], dtype=np.float64)
+        self.keys = np.array([n.note for n in notes], dtype=np.int64)
+
+        # Use Numba implementation if there is no C library.
+        # Numba is only imported here, as importing it is slow.
+        self.use_numba = self.libs.get("blocks") is None
+        if self.use_numba:
+            from . import _blocks_numba
+            if _blocks_numba.render_blocks_nb is None:
+                raise ImportError("Blocks requires the C library or Numba.")
+            _blocks_numba.warmup()
+            self.render_nb = _blocks_numba.render_blocks_nb
+        else:
+            # Parse notes once. The C functions reuse the parsed notes.
+            self.notes_handle = self.libs["blocks"].notes_parse(self.notes_str)
+
+    def __del__(self):
+        handle = getattr(self, "notes_handle", None)
+        if handle is not None:
+            self.libs["blocks"].notes_free(handle)
+            self.notes_handle = None
+
+    def visible(self, props, img: np.ndarray, frame: int) -> np.ndarray:
+        """
+        Mask of notes whose block is on screen at frame.
+        Same bounds as the C ``render_blocks``, with one pixel of margin
+        so a note drawn there is never excluded.
+        """
+        half = img.shape[0] // 2
+        speed = props.blocks.speed * (half / int(props.video.fps))
+        y_start = half + speed * (frame-self.starts)
+        y_end = half + speed * (frame-self.ends)
+
+        y_up = np.minimum(y_start, y_end)
+        y_down = np.maximum(y_start, y_end)
+        return (y_down >= -1) & (y_up <= half+1)
+
     def render(self, props, img: np.ndarray, frame: int):
         """
         Render the blocks.
-        :param notes: MIDI notes from parse_midi.
+        Skips rendering if no blocks are on screen, since the image
+        would be unchanged.
         """
+        if not self.visible(props, img, frame).any():
+            return
+
+        if self.use_numba:
+            self.render_nb(
+                img, frame, self.starts, self.ends, self.keys,
+                props.video.fps, props.piano.black_width_fac, props.blocks.speed,
+                props.blocks.color, props.blocks.radius, props.blocks.bottom_glow,
+                props.blocks.bottom_glow_len,
+            )
+            return
+
         self.libs["blocks"].render_blocks(
             img, img.shape[1], img.shape[0],
-            frame, self.notes_str,
+            frame, self.notes_handle,
             props.video.fps, props.piano.black_width_fac, props.blocks.speed,
             props.blocks.color, props.blocks.radius, props.blocks.bottom_glow,
             props.blocks.bottom_glow_len,
         )
+
+    def render_range(self, props, imgs: np.ndarray, frame_start: int,
+            ranges: Optional[Accessor] = None):
+        """
+        Render the blocks of consecutive frames in one C call.
+        Only frames from the first to the last with blocks on screen are
+        passed, and the call is skipped if there are none.
+        With Numba, renders each frame separately.
+        See ``Effect.render_range``.
+
+        :param ranges: Values of the frames from ``Scene.values_range``.
+            If None, animated values are gathered from ``props``.
+        """
+        if self.use_numba:
+            super().render_range(props, imgs, frame_start)
+            return
+
+        shown = [i for i, p in enumerate(props)
+            if self.visible(p, imgs[i], frame_start+i).any()]
+        if not shown:
+            return
+        first, last = shown[0], shown[-1] + 1
+        props = props[first:last]
+        imgs = imgs[first:last]
+        frame_start += first
+
+        count, height, width = imgs.shape[:3]
+        assert imgs.flags.c_contiguous
+
+        def per_frame(name):
+            if ranges is None:
+                v = [getattr(p.blocks, name) for p in props]
+            else:
+                v = getattr(ranges.blocks, name)[first:last]
+            return np.ascontiguousarray(v, dtype=np.float64)
+
+        self.libs["blocks"].render_blocks_batch(
+            imgs.reshape(count*height, width, 3), width, height,
+            frame_start, count, self.notes_handle,
+            props[0].video.fps, props[0].piano.black_width_fac,
+            per_frame("speed"),
+            per_frame("color").reshape(-1),
+            per_frame("radius"),
+            per_frame("bottom_glow"),
+            per_frame("bottom_glow_len"),
+        )
@@ -31,3 +31,17 @@ class Effect:
         Override this in the subclass.
         """
         raise NotImplementedError("Override Effect.render")
+
+    def render_range(self, props: Sequence[Accessor], imgs: np.ndarray,
+            frame_start: int, *args, **kwargs) -> None:
+        """
+        Render consecutive frames starting at ``frame_start``.
+
+        Default implementation calls ``self.render`` for each frame.
+        Override in the subclass if frames can be rendered together.
+
+        :param props: Props of each frame.
+        :param imgs: Images of shape ``(len(props), height, width, 3)``.
+        """
+        for i, p in enumerate(props):
+            self.render(p, imgs[i], frame_start+i, *args, **kwargs)
@@ -16,7 +16,8 @@ def log(type: str, msg: str, color: str):
     s = f"[{time()}] {type}:"
     s += " " * (6-len(type))
     s += msg
-    print(termcolor.colored(s, color), file=sys.stderr)
+    # One write per line, so lines logged from threads don't interleave.
+    sys.stderr.write(termcolor.colored(s, color) + "\n")
 
 def info(msg: str) -> None:
     """
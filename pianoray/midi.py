@@ -1,9 +1,17 @@
-import io
 import os
 import struct
 from typing import Any, Mapping, Sequence
 
 import mido
+import numpy as np
+
+# Serialized note, see docs.
+NOTE_DTYPE = np.dtype([
+    ("start", "<f8"),
+    ("end", "<f8"),
+    ("note", "u1"),
+    ("velocity", "u1"),
+])
 
 
 class Note:
@@ -63,12 +71,9 @@ def parse_midi(props) -> Sequence[Note]:
 def serialize_midi(notes) -> bytes:
     """
     Serialize according to description in docs.
+    Notes are packed into one structured array instead of one
+    ``struct.pack`` per note.
     """
-    data = io.BytesIO()
-
-    data.write(struct.pack("<I", len(notes)))
-    for n in notes:
-        data.write(struct.pack("<ddBB", n.start, n.end, n.note, n.velocity))
-
-    data.seek(0)
-    return data.read()
+    data = np.array([(n.start, n.end, n.note, n.velocity) for n in notes],
+        dtype=NOTE_DTYPE)
+    return struct.pack("<I", len(notes)) + data.tobytes()
@@ -9,13 +9,16 @@ import numpy as np
 from ..utils import bounds
 
 
-def composite(libs, props, raw_img):
+def composite(libs, props, raw_img, out=None):
     """
     Convert raw image (float64) into actual image (int8).
     Also adds some effects e.g. glare.
     Will change ``raw_img``.
+
+    :param out: Optional uint8 image to write to, instead of allocating
+        a new one. Returned.
     """
-    img = np.empty_like(raw_img, dtype=np.uint8)
+    img = np.empty_like(raw_img, dtype=np.uint8) if out is None else out
 
     libs["composite"].composite(
         raw_img, img, img.shape[1], img.shape[0],
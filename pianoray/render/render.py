@@ -3,6 +3,7 @@ Rendering pipeline.
 """
 
 import ctypes
+import importlib.util
 import json
 import os
 from pathlib import Path
@@ -10,7 +11,7 @@ from typing import Mapping
 
 import cv2
 import numpy as np
-from tqdm import trange
+from tqdm import tqdm
 
 from .. import logger
 from ..cpp import Types, load_libs
@@ -19,6 +20,9 @@ from ..effects import Blocks, Keyboard, Glare, Particles
 from .composite import add_fade, composite
 from .video import Video
 
+# Frames rendered together by effects that support render_range.
+BATCH_SIZE = 4
+
 
 def check_previous(args, settings, cache):
     """
@@ -59,9 +63,11 @@ def render_video(args, scene, out: str, cache: Path) -> None:
 
     :param args: Argparse arguments.
     """
-    # Libraries
+    # Libraries. Blocks can fall back to Numba if its library fails.
+    has_numba = importlib.util.find_spec("numba") is not None
+    optional = ("blocks",) if has_numba else ()
     try:
-        libs = load_libs(cache)
+        libs = load_libs(cache, optional)
     except AssertionError:
         logger.error("Failed to build libraries.")
         raise
@@ -129,28 +135,47 @@ def render_frames(scene, libs, video, cache, real_start=None) -> int:
         (frame_start, frame_end, real_start))
     logger.info(f"Starting render from frame {real_start}")
 
+    # Precompute animated values.
+    scene.bake(real_start, frame_end)
+
     # Render
     num_frames = real_start - frame_start
     video.frame = num_frames
-    for frame in trange(real_start, frame_end, desc="Rendering"):
-        # Save state
-        num_frames += 1
-        with open(cache/"currently_rendering.txt", "w") as fp:
-            fp.write(str(frame))
-
-        # Create image
-        shape = (*scene.default.video.resolution[::-1], 3)
-        raw_img = np.zeros(shape, dtype=np.float64)
-
-        # Apply effects
-        props = scene.values(frame)
-        blocks.render(props, raw_img, frame)
-        #ptcls.render(props, img, frame, notes)
-        #glare.render(props, img, frame, notes)
-
-        # Compositing
-        img = composite(libs, props, raw_img)
-        keyboard.render(props, img, frame)
-        add_fade(scene.default, img, frame_start, frame_end, frame)
-
-        video.write(img)
+    shape = (*scene.default.video.resolution[::-1], 3)
+    pbar = tqdm(total=frame_end-real_start, desc="Rendering")
+
+    # Image buffers, reused every batch.
+    raw_buffer = np.empty((BATCH_SIZE, *shape), dtype=np.float64)
+    img_buffer = np.empty(shape, dtype=np.uint8)
+
+    for batch_start in range(real_start, frame_end, BATCH_SIZE):
+        frames = range(batch_start, min(batch_start+BATCH_SIZE, frame_end))
+
+        # Clear images
+        raw_imgs = raw_buffer[:len(frames)]
+        raw_imgs.fill(0)
+
+        # Apply effects that render a batch at once
+        props_batch = [scene.values(frame) for frame in frames]
+        ranges = scene.values_range(np.array(frames), pgroups=("blocks",))
+        blocks.render_range(props_batch, raw_imgs, batch_start, ranges)
+
+        for frame, props, raw_img in zip(frames, props_batch, raw_imgs):
+            # Save state
+            num_frames += 1
+            with open(cache/"currently_rendering.txt", "w") as fp:
+                fp.write(str(frame))
+
+            # Apply effects
+            #ptcls.render(props, img, frame, notes)
+            #glare.render(props, img, frame, notes)
+
+            # Compositing
+            img = composite(libs, props, raw_img, img_buffer)
+            keyboard.render(props, img, frame)
+            add_fade(scene.default, img, frame_start, frame_end, frame)
+
+            video.write(img)
+            pbar.update()
+
+    pbar.close()
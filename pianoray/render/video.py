@@ -5,7 +5,7 @@ Video writer.
 import os
 import shutil
 from pathlib import Path
-from subprocess import Popen, PIPE
+from subprocess import DEVNULL, PIPE, Popen
 from typing import Sequence
 
 import cv2
@@ -105,11 +105,17 @@ class Video:
 
 
 def run_ffmpeg(args: Sequence[str]):
+    """
+    Run FFmpeg and raise ValueError if it fails.
+    stdout is discarded. stderr is read while FFmpeg runs, so a full pipe
+    can't block it, and is included in the error message.
+    """
     args = list(map(str, args))
-    proc = Popen(args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-    proc.wait()
+    proc = Popen(args, stdin=PIPE, stdout=DEVNULL, stderr=PIPE)
+    _, stderr = proc.communicate()
 
     if proc.returncode != 0:
         msg = f"FFmpeg exited with code {proc.returncode}. " + \
-            "Command: " + " ".join(args)
+            "Command: " + " ".join(args) + "\n" + \
+            stderr.decode(errors="replace")
         raise ValueError(msg)